@@ -1,8 +1,8 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
-from typing import Optional, Dict
+from typing import Optional, Dict, Set, Union
 import json
 from ..services.rag_chain import conversational_rag_chain
-from ..config import Settings
+from ..config import Settings, MAX_CONCURRENT_QUESTIONS
 import logging
 from starlette.websockets import WebSocketState
 import asyncio
@@ -13,8 +13,13 @@ logger = logging.getLogger(__name__)
 # Store active WebSocket connections
 active_connections: Dict[str, WebSocket] = {}
 
+# Client-supplied id used to tag the chunks of each question
+QuestionId = Union[str, int]
+
 @router.websocket("/chat/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
+    in_flight: Dict[QuestionId, asyncio.Task] = {}
+    untagged_tasks: Set[asyncio.Task] = set()
     try:
         # Check if there's an existing connection for this session
         if session_id in active_connections:
@@ -58,6 +63,56 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
             "message": "WebSocket connection established"
         })
         
+        # Questions are answered concurrently, each in its own task. Sends are
+        # serialised so chunks from different questions never interleave mid-frame.
+        send_lock = asyncio.Lock()
+        untagged_lock = asyncio.Lock()
+        # Each accepted question holds a slot until it finishes. The receive loop
+        # waits for a free slot before reading on, so clients cannot queue unbounded work.
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUESTIONS)
+        send_failed = False
+
+        async def send(payload: dict):
+            nonlocal send_failed
+            async with send_lock:
+                if send_failed or websocket.client_state != WebSocketState.CONNECTED:
+                    return
+                try:
+                    await websocket.send_json(payload)
+                except Exception:
+                    # The client is gone; drop everything still queued for it
+                    send_failed = True
+                    raise
+
+        async def answer(question_id: Optional[QuestionId], question: str):
+            try:
+                async for chunk in conversational_rag_chain.astream(session_id, question):
+                    payload = {"type": "assistant", "content": chunk}
+                    if question_id is not None:
+                        payload["id"] = question_id
+                    await send(payload)
+                if question_id is not None:
+                    await send({"type": "done", "id": question_id})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error processing message: {str(e)}")
+                payload = {"type": "error", "content": f"Error processing message: {str(e)}"}
+                if question_id is not None:
+                    payload["id"] = question_id
+                try:
+                    await send(payload)
+                except Exception:
+                    pass
+            finally:
+                in_flight.pop(question_id, None)
+                semaphore.release()
+
+        async def answer_untagged(question: str):
+            # Messages without an id keep the original one-at-a-time ordering
+            async with untagged_lock:
+                await answer(None, question)
+
         # Process messages
         while True:
             try:
@@ -65,40 +120,56 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                     break
                 data = await websocket.receive_text()
                 message = json.loads(data)
-                
-                if "content" not in message:
-                    if websocket.client_state == WebSocketState.CONNECTED:
-                        await websocket.send_json({
-                            "type": "error",
-                            "content": "Invalid message format"
-                        })
+
+                if not isinstance(message, dict) or "content" not in message:
+                    await send({
+                        "type": "error",
+                        "content": "Invalid message format"
+                    })
                     continue
-                
-                # Stream response from RAG chain
-                async for chunk in conversational_rag_chain.astream(session_id, message["content"]):
-                    if websocket.client_state == WebSocketState.CONNECTED:
-                        await websocket.send_json({
-                            "type": "assistant",
-                            "content": chunk
-                        })
-                
+
+                question_id = message.get("id")
+
+                if question_id is None:
+                    await semaphore.acquire()
+                    task = asyncio.create_task(answer_untagged(message["content"]))
+                    untagged_tasks.add(task)
+                    task.add_done_callback(untagged_tasks.discard)
+                    continue
+
+                if not isinstance(question_id, (str, int)) or isinstance(question_id, bool):
+                    await send({
+                        "type": "error",
+                        "content": "Message id must be a string or integer"
+                    })
+                    continue
+
+                if question_id in in_flight:
+                    await send({
+                        "type": "error",
+                        "id": question_id,
+                        "content": f"A question with id {question_id} is already in progress"
+                    })
+                    continue
+
+                await semaphore.acquire()
+                in_flight[question_id] = asyncio.create_task(answer(question_id, message["content"]))
+
             except WebSocketDisconnect:
                 logger.info(f"WebSocket disconnected for session {session_id}")
                 break
             except json.JSONDecodeError:
                 logger.error("Invalid JSON received")
-                if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_json({
-                        "type": "error",
-                        "content": "Invalid message format"
-                    })
+                await send({
+                    "type": "error",
+                    "content": "Invalid message format"
+                })
             except Exception as e:
                 logger.error(f"Error processing message: {str(e)}")
-                if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_json({
-                        "type": "error",
-                        "content": f"Error processing message: {str(e)}"
-                    })
+                await send({
+                    "type": "error",
+                    "content": f"Error processing message: {str(e)}"
+                })
                 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for session {session_id}")
@@ -113,6 +184,9 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         except:
             pass
     finally:
+        # Cancel any questions still being answered for this connection
+        for task in [*in_flight.values(), *untagged_tasks]:
+            task.cancel()
         # Cleanup
         if session_id in active_connections and active_connections[session_id] == websocket:
             del active_connections[session_id]
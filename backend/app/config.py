@@ -19,6 +19,14 @@ SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
 ALLOWED_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
+# Document parser settings
+PDF_PARSER_BACKEND = os.getenv("PDF_PARSER_BACKEND", "auto")  # auto, pypdfium2 or pypdf
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", min(4, os.cpu_count() or 1)))
+PARSER_TIMEOUT = float(os.getenv("PARSER_TIMEOUT", "30"))  # seconds per PDF
+MAX_DOCX_XML_SIZE = 50 * 1024 * 1024  # uncompressed size of the DOCX text parts
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "50"))
+MIN_PAGES_PER_BATCH = 8  # PDFs up to this many pages are parsed by a single worker
+
 # Model settings
 MODEL_NAME = "mistral"
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
@@ -27,6 +35,18 @@ EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 API_PREFIX = "/api"
 CORS_ORIGINS = ["http://localhost:3000"]
 
+# Chat settings
+MAX_CONCURRENT_QUESTIONS = int(os.getenv("MAX_CONCURRENT_QUESTIONS", "4"))  # per WebSocket connection
+
+# Standard screening questions answered in the background after each upload
+STANDARD_QUESTIONS = [
+    "Summarize this resume.",
+    "What are the candidate's skills?",
+    "How many years of experience does the candidate have?",
+    "What is the candidate's education?",
+]
+PRECOMPUTE_CONCURRENCY = int(os.getenv("PRECOMPUTE_CONCURRENCY", "1"))  # across all sessions
+
 class Settings(BaseSettings):
     # Vector store settings
     VECTOR_STORE_DIR: str = str(VECTOR_STORE_DIR)
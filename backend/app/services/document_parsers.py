@@ -0,0 +1,267 @@
+import io
+import os
+import codecs
+import re
+import time
+import zipfile
+import logging
+import threading
+import multiprocessing
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from typing import Callable, Dict, List, Tuple
+from langchain.schema import Document
+from app.services.pdf_extraction import extract_pdf_pages
+from app.config import (
+    PDF_PARSER_BACKEND,
+    PARSER_WORKERS,
+    PARSER_TIMEOUT,
+    MAX_PDF_PAGES,
+    MIN_PAGES_PER_BATCH,
+    MAX_DOCX_XML_SIZE,
+)
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # pragma: no cover - optional fast backend
+    pdfium = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+Parser = Callable[[bytes, str], List[Document]]
+
+_parsers: Dict[str, Parser] = {}
+# Idle single-process PDF workers. Each upload checks out its own, so killing them
+# on a timeout never touches another upload's parse.
+_idle_pdf_workers: List[ProcessPoolExecutor] = []
+_pdf_workers_lock = threading.Lock()
+
+
+def register_parser(*extensions: str):
+    """Register a parser function for the given file extensions."""
+    def decorator(func: Parser) -> Parser:
+        for ext in extensions:
+            _parsers[ext.lower()] = func
+        return func
+    return decorator
+
+
+def get_parser(file_ext: str) -> Parser:
+    """Get the parser registered for a file extension."""
+    parser = _parsers.get(file_ext.lower())
+    if parser is None:
+        raise ValueError(f"No parser registered for file type: {file_ext}")
+    return parser
+
+
+def parse_document(file_content: bytes, filename: str) -> List[Document]:
+    """Parse raw file content into documents using the registered parser."""
+    file_ext = os.path.splitext(filename)[1].lower()
+    parser = get_parser(file_ext)
+    start = time.perf_counter()
+    documents = parser(file_content, filename)
+    logger.info(
+        f"Parsed {filename} with {parser.__name__} in {time.perf_counter() - start:.3f}s"
+    )
+    return documents
+
+
+# Plain text
+
+@register_parser(".txt")
+def parse_text(file_content: bytes, filename: str) -> List[Document]:
+    """Decode plain text directly, without going through a loader."""
+    # Windows "Unicode" text files are UTF-16 with a byte order mark
+    if file_content.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        try:
+            text = file_content.decode("utf-16")
+        except UnicodeDecodeError:
+            raise ValueError(f"{filename} is not a valid UTF-16 text file")
+        return [Document(page_content=text, metadata={"source": filename})]
+    try:
+        text = file_content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = file_content.decode("latin-1")
+    return [Document(page_content=text, metadata={"source": filename})]
+
+
+# DOCX
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_PART_RE = re.compile(r"word/(header|footer)(\d*)\.xml")
+
+
+def _docx_parts(archive: zipfile.ZipFile, kind: str) -> List[str]:
+    """Return the header or footer parts of a DOCX archive in numeric order."""
+    parts = []
+    for name in archive.namelist():
+        match = _DOCX_PART_RE.fullmatch(name)
+        if match and match.group(1) == kind:
+            parts.append((int(match.group(2) or 0), name))
+    return [name for _, name in sorted(parts)]
+
+
+def _stream_docx_part(stream) -> List[str]:
+    """Stream paragraphs out of a WordprocessingML part."""
+    paragraphs = []
+    runs = []
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        tag = elem.tag
+        if tag == _W_NS + "t":
+            runs.append(elem.text or "")
+        elif tag == _W_NS + "tab":
+            runs.append("\t")
+        elif tag in (_W_NS + "br", _W_NS + "cr"):
+            runs.append("\n")
+        elif tag == _W_NS + "p":
+            paragraphs.append("".join(runs))
+            runs = []
+            # Drop the finished paragraph so memory stays flat on long documents
+            elem.clear()
+    return paragraphs
+
+
+@register_parser(".docx")
+def parse_docx(file_content: bytes, filename: str) -> List[Document]:
+    """Extract DOCX text by streaming the document XML from the zip archive."""
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(file_content))
+    except zipfile.BadZipFile:
+        raise ValueError(f"{filename} is not a valid DOCX file")
+
+    with archive:
+        if "word/document.xml" not in archive.namelist():
+            raise ValueError(f"{filename} is not a valid DOCX file")
+        parts = _docx_parts(archive, "header") + ["word/document.xml"] + _docx_parts(archive, "footer")
+        # A small compressed upload can inflate to gigabytes of XML; check before streaming.
+        # The zip reader stops at the declared size, so the check cannot be bypassed.
+        if sum(archive.getinfo(part).file_size for part in parts) > MAX_DOCX_XML_SIZE:
+            raise ValueError(f"{filename} expands to more text than the allowed limit")
+        paragraphs = []
+        seen = set()
+        for part in parts:
+            with archive.open(part) as stream:
+                for paragraph in _stream_docx_part(stream):
+                    if not paragraph.strip():
+                        continue
+                    # Default, first-page and even-page header variants often repeat the same text
+                    if part != "word/document.xml" and paragraph in seen:
+                        continue
+                    seen.add(paragraph)
+                    paragraphs.append(paragraph)
+
+    text = "\n".join(paragraphs)
+    return [Document(page_content=text, metadata={"source": filename})]
+
+
+@register_parser(".doc")
+def parse_doc(file_content: bytes, filename: str) -> List[Document]:
+    """Handle .doc uploads, which are often DOCX files with the old extension."""
+    if not zipfile.is_zipfile(io.BytesIO(file_content)):
+        raise ValueError(
+            "Legacy Word .doc files are not supported. Please save the file as DOCX or PDF."
+        )
+    return parse_docx(file_content, filename)
+
+
+# PDF
+
+def _resolve_pdf_backend() -> str:
+    """Pick the PDF backend, preferring pypdfium2 when it is installed."""
+    if PDF_PARSER_BACKEND == "pypdf":
+        return "pypdf"
+    if pdfium is not None:
+        return "pypdfium2"
+    if PDF_PARSER_BACKEND == "pypdfium2":
+        logger.warning("pypdfium2 is not installed, falling back to pypdf")
+    return "pypdf"
+
+
+def _checkout_pdf_workers(count: int) -> List[ProcessPoolExecutor]:
+    """Take single-process workers for one upload, reusing idle ones where possible."""
+    with _pdf_workers_lock:
+        workers = [_idle_pdf_workers.pop() for _ in range(min(count, len(_idle_pdf_workers)))]
+    while len(workers) < count:
+        # Spawn rather than fork: the server process is threaded and has torch loaded
+        workers.append(ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")))
+    return workers
+
+
+def _release_pdf_workers(workers: List[ProcessPoolExecutor]) -> None:
+    """Return idle workers to the cache, keeping at most PARSER_WORKERS warm."""
+    with _pdf_workers_lock:
+        kept = workers[:max(0, PARSER_WORKERS - len(_idle_pdf_workers))]
+        _idle_pdf_workers.extend(kept)
+    for worker in workers[len(kept):]:
+        worker.shutdown(wait=False)
+
+
+def _discard_pdf_workers(workers: List[ProcessPoolExecutor], terminate: bool) -> None:
+    """Stop an upload's workers. Nothing else uses them, so other uploads are unaffected."""
+    for worker in workers:
+        # ProcessPoolExecutor has no public way to kill running workers, and shutdown()
+        # drops the process table, so take it first
+        processes = list((worker._processes or {}).values()) if terminate else []
+        worker.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+
+def _wait_pdf_futures(futures: List[Future], deadline: float, filename: str) -> List[Tuple[int, List[str]]]:
+    done, pending = wait(futures, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_EXCEPTION)
+    for future in done:
+        if future.exception() is not None:
+            for other in pending:
+                other.cancel()
+            raise ValueError(f"{filename} is not a valid PDF file: {str(future.exception())}")
+    if pending:
+        raise TimeoutError(f"Timed out parsing {filename} after {PARSER_TIMEOUT}s")
+    return [future.result() for future in futures]
+
+
+@register_parser(".pdf")
+def parse_pdf(file_content: bytes, filename: str) -> List[Document]:
+    """Extract PDF text one document per page, in worker processes bounded by PARSER_TIMEOUT."""
+    backend = _resolve_pdf_backend()
+    deadline = time.monotonic() + PARSER_TIMEOUT
+    workers = _checkout_pdf_workers(1)
+    try:
+        # The first batch also reports the page count, so short files need one round trip
+        first = workers[0].submit(extract_pdf_pages, backend, file_content, 0, MIN_PAGES_PER_BATCH)
+        page_count, texts = _wait_pdf_futures([first], deadline, filename)[0]
+
+        if page_count > MAX_PDF_PAGES:
+            logger.warning(
+                f"{filename} has {page_count} pages, only the first {MAX_PDF_PAGES} will be processed"
+            )
+            page_count = MAX_PDF_PAGES
+        texts = texts[:page_count]
+
+        remaining = page_count - len(texts)
+        if remaining > 0:
+            batch_size = max(MIN_PAGES_PER_BATCH, -(-remaining // PARSER_WORKERS))
+            starts = list(range(len(texts), page_count, batch_size))
+            # One worker per batch, so a batch never queues behind another upload
+            workers += _checkout_pdf_workers(len(starts) - 1)
+            futures = [
+                worker.submit(extract_pdf_pages, backend, file_content, start, min(start + batch_size, page_count))
+                for worker, start in zip(workers, starts)
+            ]
+            for _, batch in _wait_pdf_futures(futures, deadline, filename):
+                texts.extend(batch)
+    except TimeoutError as e:
+        # Kill this upload's workers so a stuck parse stops using CPU
+        _discard_pdf_workers(workers, terminate=True)
+        raise ValueError(str(e))
+    except Exception:
+        # Let any batch still running finish on its own, then the workers exit
+        _discard_pdf_workers(workers, terminate=False)
+        raise
+    _release_pdf_workers(workers)
+
+    return [
+        Document(page_content=text, metadata={"source": filename, "page": index})
+        for index, text in enumerate(texts)
+    ]
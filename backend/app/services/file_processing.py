@@ -1,13 +1,13 @@
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 import os
-import tempfile
+import asyncio
 from typing import List
 from langchain.schema import Document
 from app.config import VECTOR_STORE_DIR, ALLOWED_EXTENSIONS, MAX_FILE_SIZE
 from app.services.rag_chain import conversational_rag_chain
+from app.services.document_parsers import parse_document
 import logging
 
 # Set up logging
@@ -19,25 +19,16 @@ async def process_uploaded_file(file_content: bytes, filename: str, session_id:
     if len(file_content) > MAX_FILE_SIZE:
         raise ValueError(f"File size exceeds maximum allowed size of {MAX_FILE_SIZE / 1024 / 1024}MB")
 
-    # Create a temporary file with the correct extension
+    # Validate file type
     file_ext = os.path.splitext(filename)[1].lower()
     if file_ext not in ALLOWED_EXTENSIONS:
         raise ValueError(f"Unsupported file type: {file_ext}. Please upload a PDF or DOCX file.")
 
-    # Create a temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-        temp_file.write(file_content)
-        temp_file_path = temp_file.name
-
     try:
-        # Load the document based on file type
-        if file_ext == '.pdf':
-            loader = PyPDFLoader(temp_file_path)
-        else:  # .docx or .doc
-            loader = Docx2txtLoader(temp_file_path)
-        
-        # Extract text from the document
-        documents = loader.load()
+        # Extract text off the event loop using the parser registered for this file type.
+        # PDFs are bounded by PARSER_TIMEOUT; text and DOCX are bounded by size limits.
+        loop = asyncio.get_running_loop()
+        documents = await loop.run_in_executor(None, parse_document, file_content, filename)
         logger.info(f"Loaded {len(documents)} documents from {filename}")
 
         # Split documents into manageable chunks
@@ -67,14 +58,11 @@ async def process_uploaded_file(file_content: bytes, filename: str, session_id:
         conversational_rag_chain.add_retriever(session_id, retriever)
         logger.info(f"Added retriever to RAG chain for session {session_id}")
 
+        # Answer the standard screening questions in the background
+        conversational_rag_chain.schedule_precompute(session_id)
+
         return splits
 
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}")
-        raise Exception(f"Error processing file: {str(e)}")
-    finally:
-        # Clean up the temporary file
-        try:
-            os.unlink(temp_file_path)
-        except:
-            pass
\ No newline at end of file
+        raise Exception(f"Error processing file: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,30 @@
+import io
+from typing import List, Tuple
+
+# This module runs inside PDF worker processes. It only imports the PDF libraries
+# so that starting a worker does not pay for loading langchain or the app config.
+
+
+def extract_pdf_pages(backend: str, file_content: bytes, start: int, stop: int) -> Tuple[int, List[str]]:
+    """Return the page count and the text of pages [start, stop)."""
+    texts = []
+    if backend == "pypdfium2":
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(file_content)
+        try:
+            page_count = len(pdf)
+            for index in range(start, min(stop, page_count)):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+    else:
+        from pypdf import PdfReader
+        reader = PdfReader(io.BytesIO(file_content))
+        page_count = len(reader.pages)
+        for index in range(start, min(stop, page_count)):
+            texts.append(reader.pages[index].extract_text() or "")
+    return page_count, texts
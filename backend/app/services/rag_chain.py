@@ -4,14 +4,35 @@ from langchain.memory import ConversationBufferMemory
 from langchain.prompts import PromptTemplate
 from app.services.vector_store import VectorStoreManager, vector_store_manager
 from pydantic import SecretStr
+import asyncio
 import logging
 import os
-from app.config import settings
+import re
+from typing import Dict, List, Optional
+from app.config import settings, STANDARD_QUESTIONS, PRECOMPUTE_CONCURRENCY
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+NO_RELEVANT_INFO = "No relevant information found in the resume."
+
+def normalize_question(question: str) -> str:
+    """Normalize a question so trivially different phrasings share a cache key."""
+    question = re.sub(r"['\u2019]", "", question.lower())
+    return re.sub(r"[^a-z0-9]+", " ", question).strip()
+
+def build_prompt(context: List[str], question: str) -> str:
+    return f"""Based on the following resume content, please answer the question. 
+            If the information is not in the resume, say so.
+
+            Resume Content:
+            {' '.join(context)}
+
+            Question: {question}
+
+            Answer:"""
+
 class RAGChain:
     def __init__(self):
         try:
@@ -38,6 +59,15 @@ class RAGChain:
         )
         self.retrievers = {}
         self.chains = {}  # Store chains for each session
+        # One entry per STANDARD_QUESTIONS item, keyed by session then normalized question.
+        # Each entry's future resolves to the stored result, or None if there is none.
+        self.precomputed: Dict[str, Dict[str, dict]] = {}
+        self.precompute_tasks: Dict[str, asyncio.Task] = {}
+        self.precompute_semaphore = asyncio.Semaphore(PRECOMPUTE_CONCURRENCY)
+        # Background work only starts while no live question is being answered
+        self.live_questions = 0
+        self.live_idle = asyncio.Event()
+        self.live_idle.set()
         logger.info("RAGChain initialized successfully")
 
     def get_chain(self, session_id: str):
@@ -84,7 +114,21 @@ class RAGChain:
     async def astream(self, session_id: str, question: str):
         try:
             logger.info(f"Starting astream for session {session_id} with question: {question}")
-            
+
+            # A standard question is answered once per upload: reuse the background
+            # answer, wait for it if it is running, or take it over if it has not started
+            claimed = None
+            entry = self.get_precomputed(session_id, question)
+            if entry and entry["claimed"]:
+                precomputed = await entry["future"]
+                if precomputed:
+                    logger.info(f"Answering from precomputed results for session {session_id}")
+                    yield precomputed["answer"]
+                    return
+            elif entry:
+                entry["claimed"] = True
+                claimed = entry
+
             # Get or create chain for this session
             try:
                 chain = self.get_chain(session_id)
@@ -100,39 +144,50 @@ class RAGChain:
                 yield "No resume data found. Please upload a resume first."
                 return
 
-            logger.info(f"Retrieved documents for question: {question}")
-            context = retriever.get_relevant_documents(question)
-            logger.info(f"Found {len(context)} relevant documents")
-
-            if not context:
-                logger.warning(f"No relevant documents found for question: {question}")
-                yield "No relevant information found in the resume."
-                return
-
-            # Generate prompt for LLM
-            logger.info("Generating prompt for LLM")
-            prompt = f"""Based on the following resume content, please answer the question. 
-            If the information is not in the resume, say so.
-
-            Resume Content:
-            {' '.join([doc.page_content for doc in context])}
+            self.live_questions += 1
+            self.live_idle.clear()
+            result = None
+            try:
+                logger.info(f"Retrieved documents for question: {question}")
+                context = await retriever.aget_relevant_documents(question)
+                logger.info(f"Found {len(context)} relevant documents")
 
-            Question: {question}
+                if not context:
+                    logger.warning(f"No relevant documents found for question: {question}")
+                    result = {"question": question, "context": [], "answer": NO_RELEVANT_INFO}
+                    yield NO_RELEVANT_INFO
+                    return
 
-            Answer:"""
+                # Generate prompt for LLM
+                logger.info("Generating prompt for LLM")
+                prompt = build_prompt([doc.page_content for doc in context], question)
 
-            # Stream the response
-            logger.info("Starting LLM response stream")
-            try:
-                async for chunk in self.llm.astream(prompt):
-                    if chunk.content:
-                        logger.debug(f"Received chunk from LLM: {chunk.content[:50]}...")
-                        yield chunk.content
-            except Exception as e:
-                logger.error(f"Error streaming LLM response: {str(e)}")
-                yield f"Error getting response from AI: {str(e)}"
+                # Stream the response
+                logger.info("Starting LLM response stream")
+                chunks = []
+                try:
+                    async for chunk in self.llm.astream(prompt):
+                        if chunk.content:
+                            logger.debug(f"Received chunk from LLM: {chunk.content[:50]}...")
+                            chunks.append(chunk.content)
+                            yield chunk.content
+                    result = {
+                        "question": question,
+                        "context": [doc.page_content for doc in context],
+                        "answer": "".join(chunks)
+                    }
+                except Exception as e:
+                    logger.error(f"Error streaming LLM response: {str(e)}")
+                    yield f"Error getting response from AI: {str(e)}"
 
-            logger.info("Completed LLM response stream")
+                logger.info("Completed LLM response stream")
+            finally:
+                self.live_questions -= 1
+                if self.live_questions == 0:
+                    self.live_idle.set()
+                # Share a taken-over standard answer; None lets later askers recompute
+                if claimed and not claimed["future"].done():
+                    claimed["future"].set_result(result)
 
         except Exception as e:
             logger.error(f"Error in RAG chain for session {session_id}: {str(e)}")
@@ -144,10 +199,92 @@ class RAGChain:
             # Clear any existing chain for this session
             if session_id in self.chains:
                 del self.chains[session_id]
+            # Answers precomputed for a previous upload no longer apply
+            self.invalidate_precomputed(session_id)
             logger.info(f"Successfully added retriever for session {session_id}")
         except Exception as e:
             logger.error(f"Error adding retriever for session {session_id}: {str(e)}")
             raise
 
+    def get_precomputed(self, session_id: str, question: str) -> Optional[dict]:
+        """Get the precompute entry for a standard question, whether or not its answer is ready."""
+        return self.precomputed.get(session_id, {}).get(normalize_question(question))
+
+    def invalidate_precomputed(self, session_id: str) -> None:
+        """Drop precomputed answers for a session and stop any work in progress."""
+        task = self.precompute_tasks.pop(session_id, None)
+        if task and not task.done():
+            task.cancel()
+        # Wake anyone waiting on an old answer so they recompute against the new upload
+        for entry in self.precomputed.pop(session_id, {}).values():
+            if not entry["future"].done():
+                entry["future"].set_result(None)
+
+    def schedule_precompute(self, session_id: str) -> None:
+        """Start answering STANDARD_QUESTIONS for a session in the background."""
+        if not STANDARD_QUESTIONS:
+            return
+        # add_retriever has already invalidated results from any previous upload
+        loop = asyncio.get_running_loop()
+        entries = {
+            normalize_question(question): {"question": question, "future": loop.create_future(), "claimed": False}
+            for question in STANDARD_QUESTIONS
+        }
+        self.precomputed[session_id] = entries
+        task = asyncio.create_task(self.precompute_answers(session_id, entries))
+        self.precompute_tasks[session_id] = task
+
+        def _cleanup(done_task: asyncio.Task):
+            if self.precompute_tasks.get(session_id) is done_task:
+                del self.precompute_tasks[session_id]
+
+        task.add_done_callback(_cleanup)
+
+    async def acquire_background_slot(self) -> None:
+        """Take a slot from the background budget at a moment when no live question is running."""
+        while True:
+            await self.live_idle.wait()
+            await self.precompute_semaphore.acquire()
+            # A live question may have started while we waited for the slot
+            if self.live_idle.is_set():
+                return
+            self.precompute_semaphore.release()
+
+    async def precompute_answers(self, session_id: str, entries: Dict[str, dict]) -> None:
+        retriever = self.retrievers.get(session_id)
+        if not retriever:
+            logger.warning(f"No retriever found for session {session_id}, skipping precompute")
+            return
+
+        for entry in entries.values():
+            if entry["claimed"]:
+                continue
+            await self.acquire_background_slot()
+            owned = False
+            result = None
+            try:
+                # A live question may have taken this one over while we waited
+                if entry["claimed"]:
+                    continue
+                entry["claimed"] = owned = True
+                question = entry["question"]
+                context = await retriever.aget_relevant_documents(question)
+                context_text = [doc.page_content for doc in context]
+                if context_text:
+                    response = await self.llm.ainvoke(build_prompt(context_text, question))
+                    answer = response.content
+                else:
+                    answer = NO_RELEVANT_INFO
+                result = {"question": question, "context": context_text, "answer": answer}
+                logger.info(f"Precomputed answer to '{question}' for session {session_id}")
+            except Exception as e:
+                logger.error(f"Error precomputing answer for session {session_id}: {str(e)}")
+            finally:
+                self.precompute_semaphore.release()
+                # Resolve even on failure or cancellation so live questions waiting on it
+                # fall back to answering it themselves
+                if owned and not entry["future"].done():
+                    entry["future"].set_result(result)
+
 # Create a single instance of RAGChain
 conversational_rag_chain = RAGChain()
\ No newline at end of file
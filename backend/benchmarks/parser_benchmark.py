@@ -0,0 +1,161 @@
+"""Benchmark the document parsers over a corpus of synthetic resumes.
+
+Run from the backend directory:
+
+    python -m benchmarks.parser_benchmark --repeat 5
+
+The corpus is generated in memory (PDF, DOCX and TXT at several sizes) so no
+binary fixtures need to be checked in. Pass --out to also write it to disk.
+"""
+import argparse
+import io
+import os
+import random
+import statistics
+import time
+import zipfile
+from typing import Dict, List, Tuple
+from app.services.document_parsers import parse_document
+
+WORDS = (
+    "python fastapi engineer project team lead developed designed built data "
+    "pipeline cloud aws docker kubernetes experience university degree skills "
+    "managed improved performance latency service api backend frontend react"
+).split()
+
+PAGE_SIZES = [1, 5, 20, 50]
+LINES_PER_PAGE = 45
+
+
+def _synthetic_lines(rng: random.Random, count: int) -> List[str]:
+    return [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(count)]
+
+
+def build_txt(pages: List[List[str]]) -> bytes:
+    return "\n\n".join("\n".join(lines) for lines in pages).encode("utf-8")
+
+
+def build_docx(pages: List[List[str]]) -> bytes:
+    """Write a minimal DOCX with one paragraph per line."""
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    paragraphs = "".join(
+        f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for lines in pages for line in lines
+    )
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{ns}"><w:body>{paragraphs}</w:body></w:document>'
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", content_types)
+        archive.writestr("_rels/.rels", rels)
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """Write a minimal text-only PDF with one page per entry in pages."""
+    page_count = len(pages)
+    font_id = 3
+    first_page_id = 4
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        font_id: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    for index, lines in enumerate(pages):
+        page_id = first_page_id + index * 2
+        content_id = page_id + 1
+        kids.append(f"{page_id} 0 R")
+        text = "".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") '\n"
+            for line in lines
+        )
+        stream = f"BT /F1 9 Tf 40 800 Td 16 TL\n{text}ET".encode("latin-1")
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("latin-1")
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>".encode("latin-1")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = out.tell()
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id]))
+    xref_offset = out.tell()
+    size = max(objects) + 1
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+    for obj_id in range(1, size):
+        out.write(b"%010d 00000 n \n" % offsets[obj_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_offset))
+    return out.getvalue()
+
+
+def build_corpus(seed: int = 0) -> Dict[str, bytes]:
+    """Build the synthetic corpus, keyed by filename."""
+    rng = random.Random(seed)
+    corpus = {}
+    for page_count in PAGE_SIZES:
+        pages = [_synthetic_lines(rng, LINES_PER_PAGE) for _ in range(page_count)]
+        corpus[f"resume_{page_count}p.pdf"] = build_pdf(pages)
+        corpus[f"resume_{page_count}p.docx"] = build_docx(pages)
+        corpus[f"resume_{page_count}p.txt"] = build_txt(pages)
+    return corpus
+
+
+def run_benchmark(corpus: Dict[str, bytes], repeat: int) -> List[Tuple[str, int, int, float, float]]:
+    results = []
+    for filename, content in corpus.items():
+        # Warm up once so worker start-up is not counted against the first file
+        documents = parse_document(content, filename)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parse_document(content, filename)
+            timings.append(time.perf_counter() - start)
+        chars = sum(len(doc.page_content) for doc in documents)
+        results.append((filename, len(content), chars, statistics.median(timings), min(timings)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per document")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic corpus")
+    parser.add_argument("--out", help="directory to write the generated corpus to")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.seed)
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        for filename, content in corpus.items():
+            with open(os.path.join(args.out, filename), "wb") as f:
+                f.write(content)
+
+    print(f"{'file':<22}{'bytes':>10}{'chars':>10}{'median ms':>12}{'min ms':>10}")
+    for filename, size, chars, median, best in run_benchmark(corpus, args.repeat):
+        print(f"{filename:<22}{size:>10}{chars:>10}{median * 1000:>12.2f}{best * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()